@@ -0,0 +1,122 @@
+import numpy as np
+from numba import njit
+
+# Cluster decay lookup for the integer distances 0..5 (see the dist <= 5
+# guard below); frozen into the compiled kernel as a constant
+DECAY = np.exp(-np.arange(6) / 1.5)
+
+
+@njit(cache=True, fastmath=True)
+def dhg_scores(cx, cy, dx, dy, dp,
+               bot_x, bot_y, bot_base_x, bot_base_y, bot_diamonds, self_idx,
+               tele_x, tele_y, tele_other_x, tele_other_y,
+               my_diamonds, competitive_pressure, time_left, is_endgame,
+               safety_weight, cluster_weight, tackle_weight,
+               danger_radius, cluster_radius,
+               time_pressure_threshold, endgame_time_threshold):
+    """Compute the DHG score of every diamond as a target, in one pass.
+
+    All inputs are scalars or NumPy arrays so the whole scoring pipeline
+    (cluster weight, safety, tackle opportunity, path efficiency) runs
+    inside compiled code with no Python object access.
+    """
+    n = dx.shape[0]
+    scores = np.empty(n, np.float32)
+
+    # Bot-to-own-base distances are target-independent: compute them once
+    # instead of once per (diamond, bot) pair
+    n_bots = bot_x.shape[0]
+    base_dist = np.empty(n_bots, np.int16)
+    for b in range(n_bots):
+        base_dist[b] = abs(bot_base_x[b] - bot_x[b]) + abs(bot_base_y[b] - bot_y[b])
+
+    # Time pressure is target-independent
+    if is_endgame:
+        time_pressure = 2.0 + (endgame_time_threshold - time_left) / 10.0
+    elif time_left < time_pressure_threshold:
+        time_pressure = 1.0 + (time_pressure_threshold - time_left) / time_pressure_threshold
+    else:
+        time_pressure = 1.0
+
+    for i in range(n):
+        tx = dx[i]
+        ty = dy[i]
+        manhattan = abs(tx - cx) + abs(ty - cy)
+        if manhattan == 0:
+            scores[i] = np.inf
+            continue
+
+        # Cluster weight: count red diamonds in the cluster first, then
+        # accumulate distance-decayed values and the red diamond bonus
+        red_clusters = 0
+        for j in range(n):
+            if (dp[j] == 2 and
+                    abs(dx[j] - tx) <= cluster_radius and
+                    abs(dy[j] - ty) <= cluster_radius):
+                red_clusters += 1
+
+        weight = 0.0
+        red_base = 0.0
+        for j in range(n):
+            dist = abs(dx[j] - tx) + abs(dy[j] - ty)
+            if dist <= 5:  # Extended cluster detection
+                base_value = dp[j] * DECAY[dist]
+                if dp[j] == 2:
+                    red_base += base_value
+                weight += base_value
+        cluster = (weight + red_base * (0.7 + red_clusters * 0.1)) * competitive_pressure
+
+        # Safety threat and tackle opportunity share one bot pass
+        total_threat = 0.0
+        tackle = 0.0
+        for b in range(n_bots):
+            if b == self_idx:
+                continue
+            d = abs(bot_x[b] - tx) + abs(bot_y[b] - ty)
+
+            if d <= danger_radius:
+                base_threat = 1.0 + bot_diamonds[b] * 0.2
+                if bot_diamonds[b] >= 3 and base_dist[b] <= 2:
+                    base_threat *= 0.4
+                total_threat += base_threat * (danger_radius - d) / danger_radius
+
+            if d <= 2 and bot_diamonds[b] >= 2 and base_dist[b] > 3:
+                intercept_bonus = 2.0 if d == 1 else 1.0
+                tackle += bot_diamonds[b] * (3 - d) * intercept_bonus
+
+        safety = 1.0 / (1.0 + total_threat * 0.3)
+        if safety < 0.02:
+            safety = 0.02
+        if is_endgame:
+            safety *= 1.5  # Extra safety in endgame
+
+        # Path efficiency via the best teleporter route
+        best_teleporter_distance = 1e18
+        teleporter_bonus = 1.0
+        for t in range(tele_x.shape[0]):
+            teleporter_path = (abs(tele_x[t] - cx) + abs(tele_y[t] - cy) +
+                               abs(tele_other_x[t] - tx) + abs(tele_other_y[t] - ty))
+            if teleporter_path < best_teleporter_distance:
+                best_teleporter_distance = teleporter_path
+                if teleporter_path < manhattan * 0.7:
+                    teleporter_bonus = 1.3
+        actual_distance = min(float(manhattan), best_teleporter_distance)
+        path_efficiency = (manhattan / max(actual_distance, 1.0)) * teleporter_bonus
+        if path_efficiency > 2.0:
+            path_efficiency = 2.0
+
+        # Dynamic inventory consideration
+        if my_diamonds >= 3:
+            inventory_factor = 1.0 + (dp[i] - 1) * 0.8
+        elif my_diamonds <= 1:
+            inventory_factor = 1.0 + (dp[i] - 1) * 0.2
+        else:
+            inventory_factor = 1.0
+
+        value_factor = (dp[i] * inventory_factor +
+                        cluster * cluster_weight +
+                        tackle * tackle_weight) * competitive_pressure
+        distance_factor = manhattan * time_pressure / path_efficiency
+        scores[i] = value_factor * safety * safety_weight / distance_factor
+
+    return scores
@@ -10,17 +10,17 @@ class Bot:
     id: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     y: int
     x: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Base(Position): ...
 
 
-@dataclass
+@dataclass(slots=True)
 class Properties:
     points: Optional[int] = None
     pair_id: Optional[str] = None
@@ -34,7 +34,7 @@ class Properties:
     base: Optional[Base] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class GameObject:
     id: int
     position: Position